@@ -4,14 +4,21 @@
 import xml.etree.ElementTree as ET
 import json
 import math
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
 
 from laser_path_utils import (get_length, get_start, get_angle,
                               move_path, path_string_to_points, rotate_path, scale_path,
                               get_overlapping, get_not_overlapping,
                               paths_to_loops, loops_to_paths,
-                              separate_closed_paths, is_inside,
+                              separate_closed_paths,
+                              divide_pathstring_parts,
                               path_to_segments)
-from laser_clipper import get_difference, get_offset_loop, get_union
+from laser_clipper import (get_bounding_box, get_difference, get_offset_loop,
+                           get_offset_loops, get_union, loop_inside_loop, merge_loops,
+                           split_overlapping)
 import svgpathtools as SVGPT
 from laser_svg_parser import separate_perims_from_cuts, parse_svgfile, model_to_svg_file
 # from joint_generators import FlatJoint, BoxJoint, TslotJoint
@@ -20,6 +27,31 @@ from laser_svg_parser import separate_perims_from_cuts, parse_svgfile, model_to_
 import argparse, csv, sys
 
 
+NUT_BOLT_SIZES = {'M2': {'nut_width': 3.3,
+                         'nut_height': 2.0,
+                         'bolt_diameter': 2},
+                  'M2.5': {'nut_width': 4.3,
+                           'nut_height': 2.0,
+                           'bolt_diameter': 2.5},
+                  'M3': {'nut_width': 5.5,
+                         'nut_height': 2.0,
+                         'bolt_diameter': 3.0},
+                  'M4': {'nut_width': 7.0,
+                         'nut_height': 2.0,
+                         'bolt_diameter': 4.0}}
+NUT_BOLT_CLEARANCE = 0.1
+
+HALF_PI = math.pi / 2
+
+# material fit adjustments for interlock, divider and flat joints, by sheet thickness
+FITS_THICK = {'Wood': {'Clearance': -0.05, 'Friction': 0.05, 'Press': 0.075},
+              'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
+              'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
+FITS_THIN = {'Wood': {'Clearance': -0.05, 'Friction': 0.04, 'Press': 0.05},
+             'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
+             'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
+
+
 class LaserParameters:
     def __init__(self, d):
         """Read parameters from a dictionary; throw on missing parameters"""
@@ -75,6 +107,51 @@ class LaserParameters:
         return getattr(self, joint + self.FIT_MAP[fit])
 
 
+class JointParameters:
+    __slots__ = ('joint_type', 'joint_align', 'angle', 'fit',
+                 'tabsize', 'tabspace', 'tabnum',
+                 'boltsize', 'boltspace', 'boltnum', 'boltlength',
+                 'intersection', 'percentage',
+                 'tabDist1', 'tabDist2', 'tabSlope',
+                 'baseDist1', 'baseDist2', 'baseSlope')
+
+    def __init__(self, d):
+        """Read joint parameters from a dictionary once; parameters a joint type doesn't use may be missing"""
+
+        def floatOrNone(val):
+            if val is None: return None
+            else: return float(val)
+
+        def intOrNone(val):
+            if val is None: return None
+            else: return int(val)
+
+        self.joint_type = d['joint_type']
+        self.joint_align = d.get('joint_align')
+        self.angle = floatOrNone(d.get('angle'))
+        self.fit = d.get('fit')
+
+        #box and tab-and-slot joints:
+        self.tabsize = floatOrNone(d.get('tabsize'))
+        self.tabspace = floatOrNone(d.get('tabspace'))
+        self.tabnum = intOrNone(d.get('tabnum'))
+
+        #bolt and t-slot joints:
+        self.boltsize = d.get('boltsize')
+        self.boltspace = floatOrNone(d.get('boltspace'))
+        self.boltnum = intOrNone(d.get('boltnum'))
+        self.boltlength = floatOrNone(d.get('boltlength'))
+
+        #slotted joints:
+        self.intersection = floatOrNone(d.get('intersection'))
+        self.percentage = floatOrNone(d.get('percentage'))
+        self.tabDist1 = floatOrNone(d.get('tabDist1'))
+        self.tabDist2 = floatOrNone(d.get('tabDist2'))
+        self.tabSlope = d.get('tabSlope')
+        self.baseDist1 = floatOrNone(d.get('baseDist1'))
+        self.baseDist2 = floatOrNone(d.get('baseDist2'))
+        self.baseSlope = d.get('baseSlope')
+
 
 def make_blank_model(attrib=None):
     """Make a valid blank model"""
@@ -88,17 +165,35 @@ def make_blank_model(attrib=None):
     return model
 
 
+@lru_cache(maxsize=4096)
+def get_edge_transform(old_edge_path):
+    """returns the start point and angle needed to line a new path up with old path"""
+    start_point = tuple(get_start(old_edge_path))
+    rotation_angle = get_angle(old_edge_path)
+    return start_point, rotation_angle
+
+
+def apply_edge_transform(new_edge_path, edge_transform):
+    """moves and rotates new path by an edge transform from get_edge_transform"""
+    start_point, rotation_angle = edge_transform
+    moved_path = move_path(new_edge_path, start_point)
+    rotated_path = rotate_path(moved_path, rotation_angle, start_point)
+    return rotated_path
+
+
 def place_new_edge_path(new_edge_path, old_edge_path):
     """moves and rotates new path to line up with old path"""
     # assert get_angle(new_edge_path) == 0
 
-    start_point = get_start(old_edge_path)
-    moved_path = move_path(new_edge_path, start_point)
+    return apply_edge_transform(new_edge_path, get_edge_transform(old_edge_path))
 
-    rotation_angle = get_angle(old_edge_path)
-    rotated_path = rotate_path(moved_path, rotation_angle, start_point)
 
-    return rotated_path
+@lru_cache(maxsize=1024)
+def effective_thickness(raw_thickness, angle):
+    """returns material thickness as seen along an edge joined at angle"""
+    if angle < HALF_PI:
+        return raw_thickness * (1 + math.cos(angle)) / math.sin(angle)
+    return raw_thickness * math.sin(angle)
 
 
 def process_edge(a_or_b, edge, parameters):
@@ -116,24 +211,27 @@ def process_edge(a_or_b, edge, parameters):
     return placed_path
 
 
-def subtract_geometry(perimeters, cuts):
-    """subtracts cuts from faces"""
-    perimeters_loops = paths_to_loops(perimeters)
-    cuts_loops = paths_to_loops(cuts)
-    differnce_loops = get_difference(perimeters_loops, cuts_loops)
-    differnce = loops_to_paths(differnce_loops)
-    # differnce = loops_to_paths(cuts_loops)
-    return differnce
+def subtract_loops(perimeters, cuts):
+    """subtracts cut loops from face loops"""
+    if not cuts:
+        return perimeters
+    # cuts whose bounding boxes miss the face don't need to go through the clipper
+    touching_cuts, _ = split_overlapping(cuts, perimeters)
+    if not touching_cuts:
+        return perimeters
+    return get_difference(perimeters, touching_cuts)
 
 
-def combine_geometry(first, second):
-    """combines two path lists"""
-    first_loops = paths_to_loops(first)
-    second_loops = paths_to_loops(second)
-    combined_loops = get_union(first_loops, second_loops)
-    combined = loops_to_paths(combined_loops)
-    # differnce = loops_to_paths(cuts_loops)
-    return combined
+def combine_loops(first, second):
+    """combines two loop lists"""
+    if not second:
+        return first
+    # loops that miss the first list entirely only need merging with each other
+    touched, _ = split_overlapping(first, second)
+    if not touched:
+        return first + merge_loops(second)
+    return get_union(first, second)
+
 
 # def get_original(tree):
 #     """returns paths of original and target geometry"""
@@ -152,7 +250,8 @@ def combine_geometry(first, second):
 #                 for path in cut_paths:
 #                     cuts.append(path)
 #                 tree[face]['Original'] = {
-#                     'paths': subtract_geometry(perimeters, cuts),
+#                     'paths': loops_to_paths(subtract_loops(
+#                         paths_to_loops(perimeters), paths_to_loops(cuts))),
 #                     'style': original_style}
 #             else:
 #                 tree[face]['Original'] = {
@@ -175,27 +274,59 @@ def get_original_tree(model):
             if cut_paths != []:
                 for path in cut_paths:
                     cuts.append(path)
+                loops = subtract_loops(
+                    paths_to_loops(perimeters), paths_to_loops(cuts))
                 tree[face] = {
-                    'paths': subtract_geometry(perimeters, cuts)}
+                    'paths': loops_to_paths(loops), 'loops': loops}
             else:
                 tree[face] = {
-                    'paths': perimeters}
+                    'paths': perimeters, 'loops': paths_to_loops(perimeters)}
     return tree
 
 
+def get_face_loops(shapes):
+    """returns the loops of a face, reusing them if they are already stored alongside its paths"""
+    if 'loops' in shapes:
+        return shapes['loops']
+    return paths_to_loops(shapes['paths'])
+
+
+def prepare_joint(joint):
+    """returns a copy of joint with its parameters read and its edge lengths measured"""
+    # read everything once, leaving the model's own joint dict untouched
+    joint = dict(joint)
+    joint['joint_parameters'] = JointParameters(joint['joint_parameters'])
+    joint['length_a'] = get_length(joint['edge_a']['d'])
+    if 'edge_b' in joint:
+        joint['length_b'] = get_length(joint['edge_b']['d'])
+    return joint
+
+
 def process_joints(model, joints, parameters):
     """takes in model of paces and returns modified model with joints applied"""
-    for _, joint in joints.items():
+    # each face collects the (extensions, cuts) of every joint it takes part in
+    by_face = defaultdict(lambda: ([], []))
+    for joint in joints.values():
+        joint = prepare_joint(joint)
         extensions = get_joint_adds(joint, model, parameters)
         for face, extension in extensions.items():
-            model['tree'][face]['paths'] = combine_geometry(
-                model['tree'][face]['paths'], extension)
-
-    for _, joint in joints.items():
+            if extension:
+                by_face[face][0].append(paths_to_loops(extension))
         cuts = get_joint_cuts(joint, model, parameters)
         for face, cut in cuts.items():
-            model['tree'][face]['paths'] = subtract_geometry(
-                model['tree'][face]['paths'], cut)
+            if cut:
+                by_face[face][1].append(paths_to_loops(cut))
+
+    # joints are still applied one at a time so the clipper sees the same
+    # operations as before, but each face stays as loops throughout
+    for face, (face_extensions, face_cuts) in by_face.items():
+        face_loops = get_face_loops(model['tree'][face])
+        for extension_loops in face_extensions:
+            face_loops = combine_loops(face_loops, extension_loops)
+        for cut_loops in face_cuts:
+            face_loops = subtract_loops(face_loops, cut_loops)
+        model['tree'][face]['loops'] = face_loops
+        model['tree'][face]['paths'] = loops_to_paths(face_loops)
     return model
 
 def get_slotted_joint_adds(joint, _, parameters):
@@ -208,25 +339,27 @@ def get_slotted_joint_adds(joint, _, parameters):
 def get_slotted_joint_cuts(joint, _, parameters):
     """genereator for slotted joints"""
     """Cut out the slots"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
     thickness = parameters.thickness
 
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
 
-    alignment = joint['joint_parameters']['joint_align']
-    fit = parameters.get_fit('slot', joint['joint_parameters']['fit'])
+    alignment = joint_params.joint_align
+    fit = parameters.get_fit('slot', joint_params.fit)
 
-    intersection = joint['joint_parameters']['intersection']
-    percentage = joint['joint_parameters']['percentage']
+    intersection = joint_params.intersection
+    percentage = joint_params.percentage
     epsilon = 0.000001
-    print(intersection)
-    print(percentage)
-    tabdist1 = joint['joint_parameters']['tabDist1']
-    tabdist2 = joint['joint_parameters']['tabDist2']
-    tabslopex, tabslopey = joint['joint_parameters']['tabSlope']
+    tabdist1 = joint_params.tabDist1
+    tabdist2 = joint_params.tabDist2
+    tabslopex, tabslopey = joint_params.tabSlope
     '''pointsa = path_string_to_points(patha) 
     starta = patha[0]
     enda = patha[len(patha) - 1]'''
@@ -247,15 +380,15 @@ def get_slotted_joint_cuts(joint, _, parameters):
            f"L {tabdist1 + intersection * percentage * tabslopex + (tabslopey * thickness)} {intersection * percentage * tabslopey + (-tabslopex * thickness)}" + \
            f"L {tabdist1 + angledtab} {0}" + \
            f"L {tabdist1 + tabdist2 + angledtab} {0}"'''
-    cuta = f"M {0} {0} " + \
-           f"L {tabdist1} {0}" + \
-           f"L {tabdist1} {intersection * percentage}" + \
-           f"L {tabdist1 + angledtab} {intersection * percentage}" + \
-           f"L {tabdist1 + angledtab} {0}" + \
-           f"L {tabdist1 + tabdist2 + angledtab} {0}"
-    basedist1 = joint['joint_parameters']['baseDist1']
-    basedist2 = joint['joint_parameters']['baseDist2']
-    baseslopex, baseslopey = joint['joint_parameters']['baseSlope']
+    cuta = "M 0 0 " \
+           f"L {tabdist1:.3f} 0" \
+           f"L {tabdist1:.3f} {intersection * percentage:.3f}" \
+           f"L {tabdist1 + angledtab:.3f} {intersection * percentage:.3f}" \
+           f"L {tabdist1 + angledtab:.3f} 0" \
+           f"L {tabdist1 + tabdist2 + angledtab:.3f} 0"
+    basedist1 = joint_params.baseDist1
+    basedist2 = joint_params.baseDist2
+    baseslopex, baseslopey = joint_params.baseSlope
 
     '''pointsb = path_string_to_points(pathb) 
     startb = pathb[0]
@@ -272,8 +405,8 @@ def get_slotted_joint_cuts(joint, _, parameters):
     print(basedist2)
     print(angledbase)
     print("\n")
-    print(joint['joint_parameters']['tabSlope'])
-    print(joint['joint_parameters']['baseSlope'])
+    print(joint_params.tabSlope)
+    print(joint_params.baseSlope)
     print("\n")
     cutb = f"M {0} {0} " + \
            f"L {basedist1} {0}" + \
@@ -284,14 +417,14 @@ def get_slotted_joint_cuts(joint, _, parameters):
     print(cuta)
     print(cutb)
     print("\n")'''
-    cutb = f"M {0} {0} " + \
-           f"L {basedist1} {0}" + \
-           f"L {basedist1} {intersection * (1-percentage)}" + \
-           f"L {basedist1 + angledbase} {intersection * (1-percentage)}" + \
-           f"L {basedist1 + angledbase} {0}" + \
-           f"L {basedist1 + basedist2 + angledbase} {0}"
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
+    cutb = "M 0 0 " \
+           f"L {basedist1:.3f} 0" \
+           f"L {basedist1:.3f} {intersection * (1-percentage):.3f}" \
+           f"L {basedist1 + angledbase:.3f} {intersection * (1-percentage):.3f}" \
+           f"L {basedist1 + angledbase:.3f} 0" \
+           f"L {basedist1 + basedist2 + angledbase:.3f} 0"
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
 
     cuta = align_joint(cuta, lengtha, thickness, alignment)
     cutb = align_joint(cutb, lengthb, thickness, alignment)
@@ -301,8 +434,8 @@ def get_slotted_joint_cuts(joint, _, parameters):
     print("\n")
     print(cuta)
     print(cutb)'''
-    cuts[facea] = [place_new_edge_path(cuta, patha)]
-    cuts[faceb] = [place_new_edge_path(cutb, pathb)]
+    cuts[facea] = [apply_edge_transform(cuta, transform_a)]
+    cuts[faceb] = [apply_edge_transform(cutb, transform_b)]
     '''
     print("\n")
     print(cuts[facea])
@@ -312,163 +445,162 @@ def get_slotted_joint_cuts(joint, _, parameters):
 
 def get_box_joint_adds(joint, _, parameters):
     """generator for box joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     adds = {}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    adda = f"M {0} {0} "+f"L {0} {thickness} " + \
-        f"L {lengtha} {thickness} "+f"L {lengtha} {0}"
-    addb = f"M {0} {0} "+f"L {0} {thickness} " + \
-        f"L {lengthb} {thickness} " + f"L {lengthb} {0}"
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    adda = f"M 0 0 L 0 {thickness:.3f} " \
+        f"L {lengtha:.3f} {thickness:.3f} L {lengtha:.3f} 0"
+    addb = f"M 0 0 L 0 {thickness:.3f} " \
+        f"L {lengthb:.3f} {thickness:.3f} L {lengthb:.3f} 0"
 
     adda = align_joint(adda, lengtha, thickness, alignment)
     addb = align_joint(addb, lengthb, thickness, alignment)
 
-    adds[facea] = [place_new_edge_path(adda, patha)]
-    adds[faceb] = [place_new_edge_path(addb, pathb)]
+    adds[facea] = [apply_edge_transform(adda, transform_a)]
+    adds[faceb] = [apply_edge_transform(addb, transform_b)]
 
     return adds
 
 def get_box_joint_cuts(joint, _, parameters):
     """generator for box joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    tabsize = joint['joint_parameters']['tabsize']
-    tabspace = joint['joint_parameters']['tabspace']
-    tabnum = joint['joint_parameters']['tabnum']
-    alignment = joint['joint_parameters']['joint_align']
-
-    fit = parameters.get_fit('box', joint['joint_parameters']['fit'])
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    tabsize = joint_params.tabsize
+    tabspace = joint_params.tabspace
+    tabnum = joint_params.tabnum
+    alignment = joint_params.joint_align
+
+    fit = parameters.get_fit('box', joint_params.fit)
 
     sega = tabsize*tabnum + tabspace*(tabnum-1) - fit
     segb = tabsize*tabnum + tabspace*(tabnum-1) + fit
     offseta = (lengtha - sega) / 2.0
     offsetb = (lengthb - segb) / 2.0
 
-    cuta = f""
-    position = offseta
-    for _ in range(tabnum):
-        cuta += f"M {position} {0} " + \
-                f"L {position} {thickness}" + \
-                f"L {position + tabsize - fit} {thickness}" + \
-                f"L {position + tabsize - fit} {0} Z "
-        position = position + tabsize+tabspace
-
-    cutb = f"M {0} {0} " + f"L {0} {thickness} " + \
-           f"L {offsetb} {thickness} " + f"L {offsetb} {0} Z "
-    position = offsetb
     step = tabsize + tabspace
-    for _ in range(tabnum - 1):
-        cutb += f"M {position+tabsize+fit} {0} " + f"L {position+tabsize+fit} {thickness} " + \
-                f"L {position+tabsize+tabspace} {thickness} " + \
-                f"L {position+tabsize+tabspace} {0} Z "
-        position = position + step
-    position = position + tabsize
-    cutb += f"M {position+fit} {0} " + f"L {position+fit} {thickness} " + \
-            f"L {lengthb} {thickness} " + f"L {lengthb} {0} Z "
+    tab_starts = offseta + np.arange(tabnum) * step
+    tab_ends = tab_starts + tabsize - fit
+    cuta_parts = []
+    for start, end in zip(tab_starts.tolist(), tab_ends.tolist()):
+        cuta_parts.append(f"M {start:.3f} 0 "
+                          f"L {start:.3f} {thickness:.3f}"
+                          f"L {end:.3f} {thickness:.3f}"
+                          f"L {end:.3f} 0 Z")
+    cuta = " ".join(cuta_parts)
+
+    gap_positions = offsetb + np.arange(max(tabnum - 1, 0)) * step
+    gap_starts = gap_positions + tabsize + fit
+    gap_ends = gap_positions + tabsize + tabspace
+    cutb_parts = [f"M 0 0 L 0 {thickness:.3f} "
+                  f"L {offsetb:.3f} {thickness:.3f} L {offsetb:.3f} 0 Z"]
+    for start, end in zip(gap_starts.tolist(), gap_ends.tolist()):
+        cutb_parts.append(f"M {start:.3f} 0 L {start:.3f} {thickness:.3f} "
+                          f"L {end:.3f} {thickness:.3f} "
+                          f"L {end:.3f} 0 Z")
+    position = offsetb + max(tabnum - 1, 0) * step + tabsize
+    cutb_parts.append(f"M {position+fit:.3f} 0 L {position+fit:.3f} {thickness:.3f} "
+                      f"L {lengthb:.3f} {thickness:.3f} L {lengthb:.3f} 0 Z")
+    cutb = " ".join(cutb_parts)
 
     cuta = align_joint(cuta, lengtha, thickness, alignment)
     cutb = align_joint(cutb, lengthb, thickness, alignment)
 
-    cuts[facea] = [place_new_edge_path(cuta, patha)]
-    cuts[faceb] = [place_new_edge_path(cutb, pathb)]
+    cuts[facea] = [apply_edge_transform(cuta, transform_a)]
+    cuts[faceb] = [apply_edge_transform(cutb, transform_b)]
 
     return cuts
 
 
 def get_bolt_joint_adds(joint, _, parameters):
     """generator for bolt joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     adds = {}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    adda = f"M {0} {thickness} "+f"L {0} {-thickness} " + \
-        f"L {lengtha} {-thickness} "+f"L {lengtha} {thickness}"
-    addb = f"M {0} {0} "+f"L {0} {thickness} " + \
-        f"L {lengthb} {thickness} "+f"L {lengthb} {0}"
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    adda = f"M 0 {thickness:.3f} L 0 {-thickness:.3f} " \
+        f"L {lengtha:.3f} {-thickness:.3f} L {lengtha:.3f} {thickness:.3f}"
+    addb = f"M 0 0 L 0 {thickness:.3f} " \
+        f"L {lengthb:.3f} {thickness:.3f} L {lengthb:.3f} 0"
 
     adda = align_joint(adda, lengtha, thickness, alignment)
     addb = align_joint(addb, lengthb, thickness, alignment)
 
-    adds[facea] = [place_new_edge_path(adda, patha)]
-    adds[faceb] = [place_new_edge_path(addb, pathb)]
+    adds[facea] = [apply_edge_transform(adda, transform_a)]
+    adds[faceb] = [apply_edge_transform(addb, transform_b)]
 
     return adds
 
 
+def get_tslot_path(left, x_steps, y_steps):
+    """returns the closed outline of a t-slot whose left side starts at left"""
+    x_0, x_1, x_2, x_3 = x_steps
+    y_0, y_2, y_3, y_4 = y_steps
+    points = ((x_1, y_0), (x_1, y_2), (x_0, y_2), (x_0, y_3),
+              (x_1, y_3), (x_1, y_4), (x_2, y_4), (x_2, y_3),
+              (x_3, y_3), (x_3, y_2), (x_2, y_2), (x_2, y_0))
+    return "M " + " L ".join(f"{left+x:.3f} {y:.3f}" for x, y in points) + " Z"
+
+
 def get_bolt_joint_cuts(joint, _, parameters):
     """generator for bolt joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
 
-    nut_bolt_sizes = {'M2': {'nut_width': 3.3,
-                             'nut_height': 2.0,
-                             'bolt_diameter': 2},
-                      'M2.5': {'nut_width': 4.3,
-                               'nut_height': 2.0,
-                               'bolt_diameter': 2.5},
-                      'M3': {'nut_width': 5.5,
-                             'nut_height': 2.0,
-                             'bolt_diameter': 3.0},
-                      'M4': {'nut_width': 7.0,
-                             'nut_height': 2.0,
-                             'bolt_diameter': 4.0}}
-    clearance = 0.1
-
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    bolt_size = joint['joint_parameters']['boltsize']
-    bolt_space = joint['joint_parameters']['boltspace']
-    bolt_num = joint['joint_parameters']['boltnum']
-    bolt_length = joint['joint_parameters']['boltlength']
-
-    nut_width = nut_bolt_sizes[bolt_size]['nut_width'] + clearance
-    nut_height = nut_bolt_sizes[bolt_size]['nut_height'] + clearance
-    bolt_diameter = nut_bolt_sizes[bolt_size]['bolt_diameter'] + clearance
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    bolt_size = joint_params.boltsize
+    bolt_space = joint_params.boltspace
+    bolt_num = joint_params.boltnum
+    bolt_length = joint_params.boltlength
+
+    nut_width = NUT_BOLT_SIZES[bolt_size]['nut_width'] + NUT_BOLT_CLEARANCE
+    nut_height = NUT_BOLT_SIZES[bolt_size]['nut_height'] + NUT_BOLT_CLEARANCE
+    bolt_diameter = NUT_BOLT_SIZES[bolt_size]['bolt_diameter'] + NUT_BOLT_CLEARANCE
 
     segment_length = nut_width * 3
     combined_length = bolt_num * segment_length + \
@@ -487,84 +619,60 @@ def get_bolt_joint_cuts(joint, _, parameters):
     y_3 = bolt_length - nut_height
     y_4 = bolt_length
 
-    cuts[facea] = []
-    # cuta = f""
+    # every fragment is placed in one go, then split back into separate paths
+    cuta_parts = []
     position = buffer_size_a
     for _ in range(bolt_num):
-        cuta = f"M {position} {0} " + \
-            f"L {position} {thickness} " + \
-            f"L {position+nut_width} {thickness} " + \
-            f"L {position+nut_width} {0} " + \
-            f"L {position} {0} "
-        cuta = align_joint(cuta, lengtha, thickness, alignment)
-        cuts[facea].append(place_new_edge_path(cuta, patha))
-        cuta = f"M {position+nut_width+x_1} {thickness/2} " + \
-            f"A {bolt_diameter/2} {bolt_diameter/2} 0 0 1 " + \
-            f"{position+nut_width+x_1 + bolt_diameter} {thickness/2} " + \
-            f"M {position+nut_width+x_1 + bolt_diameter} {thickness/2} " + \
-            f"A {bolt_diameter/2} {bolt_diameter/2} 0 0 1 " + \
-            f"{position+nut_width+x_1} {thickness/2} "
-        cuta = align_joint(cuta, lengtha, thickness, alignment)
-        cuts[facea].append(place_new_edge_path(cuta, patha))
-        cuta = f"M {position+2*nut_width} {0} " + \
-            f"L {position+2*nut_width} {thickness} " + \
-            f"L {position+nut_width+2*nut_width} {thickness} " + \
-            f"L {position+nut_width+2*nut_width} {0} Z "
-        cuta = align_joint(cuta, lengtha, thickness, alignment)
-        cuts[facea].append(place_new_edge_path(cuta, patha))
+        cuta_parts.append(f"M {position:.3f} 0 "
+                          f"L {position:.3f} {thickness:.3f} "
+                          f"L {position+nut_width:.3f} {thickness:.3f} "
+                          f"L {position+nut_width:.3f} 0 "
+                          f"L {position:.3f} 0")
+        cuta_parts.append(f"M {position+nut_width+x_1:.3f} {thickness/2:.3f} "
+                          f"A {bolt_diameter/2:.3f} {bolt_diameter/2:.3f} 0 0 1 "
+                          f"{position+nut_width+x_1 + bolt_diameter:.3f} {thickness/2:.3f} "
+                          f"M {position+nut_width+x_1 + bolt_diameter:.3f} {thickness/2:.3f} "
+                          f"A {bolt_diameter/2:.3f} {bolt_diameter/2:.3f} 0 0 1 "
+                          f"{position+nut_width+x_1:.3f} {thickness/2:.3f}")
+        cuta_parts.append(f"M {position+2*nut_width:.3f} 0 "
+                          f"L {position+2*nut_width:.3f} {thickness:.3f} "
+                          f"L {position+nut_width+2*nut_width:.3f} {thickness:.3f} "
+                          f"L {position+nut_width+2*nut_width:.3f} 0 Z")
         position = position + bolt_space + segment_length
+    cuta = align_joint(" ".join(cuta_parts), lengtha, thickness, alignment)
+    cuts[facea] = divide_pathstring_parts(apply_edge_transform(cuta, transform_a))
 
     # cuta += f"M {position} {0} " + \
     #         f"L {position} {thickness} " + \
     #         f"L {position+nut_width} {thickness} " + \
     #         f"L {position+nut_width} {0} Z "
-    cuts[faceb] = []
-    # cuta = f""
-    cutb = f"M {0} {0} " + \
-        f"L {0} {thickness} " + \
-        f"L {buffer_size_b} {thickness} " + \
-        f"L {buffer_size_b} {0} Z "
-    cutb += f"M {lengthb} {0} " + \
-        f"L {lengthb} {thickness} " + \
-        f"L {lengthb - buffer_size_b} {thickness} " + \
-        f"L {lengthb - buffer_size_b} {0} Z "
-    cutb = align_joint(cutb, lengthb, thickness, alignment)
-    cuts[faceb].append(place_new_edge_path(cutb, pathb))
-
+    # every faceb fragment (both buffer pockets and all three per-bolt
+    # pieces) is aligned and placed in one go, then split back into paths
+    cutb_parts = ["M 0 0 "
+                  f"L 0 {thickness:.3f} "
+                  f"L {buffer_size_b:.3f} {thickness:.3f} "
+                  f"L {buffer_size_b:.3f} 0 Z",
+                  f"M {lengthb:.3f} 0 "
+                  f"L {lengthb:.3f} {thickness:.3f} "
+                  f"L {lengthb - buffer_size_b:.3f} {thickness:.3f} "
+                  f"L {lengthb - buffer_size_b:.3f} 0 Z"]
     position = buffer_size_b
     for bolt in range(bolt_num):
-        cutb = f"M {position+nut_width} {0} " + \
-            f"L {position+nut_width} {thickness} " + \
-            f"L {position+nut_width*2} {thickness} " + \
-            f"L {position+nut_width*2} {0} Z "
-        cutb = align_joint(cutb, lengthb, thickness, alignment)
-        cuts[faceb].append(place_new_edge_path(cutb, pathb))
+        cutb_parts.append(f"M {position+nut_width:.3f} 0 "
+                          f"L {position+nut_width:.3f} {thickness:.3f} "
+                          f"L {position+nut_width*2:.3f} {thickness:.3f} "
+                          f"L {position+nut_width*2:.3f} 0 Z")
         if bolt < bolt_num:
-            cutb = f"M {position+segment_length} {0} " + \
-                f"L {position+segment_length} {thickness} " + \
-                f"L {position+segment_length+bolt_space} {thickness} " + \
-                f"L {position+segment_length+bolt_space} {0} Z "
-            cutb = align_joint(cutb, lengthb, thickness, alignment)
-            cuts[faceb].append(place_new_edge_path(cutb, pathb))
-        position = position + bolt_space + segment_length
-
-    position = buffer_size_b
-    for bolt in range(bolt_num):
-        cutb = f"M {position+nut_width+x_1} {y_0} " + \
-            f"L {position+nut_width+x_1} {y_2} " + \
-            f"L {position+nut_width+x_0} {y_2} " + \
-            f"L {position+nut_width+x_0} {y_3} " + \
-            f"L {position+nut_width+x_1} {y_3} " + \
-            f"L {position+nut_width+x_1} {y_4} " + \
-            f"L {position+nut_width+x_2} {y_4} " + \
-            f"L {position+nut_width+x_2} {y_3} " + \
-            f"L {position+nut_width+x_3} {y_3} " + \
-            f"L {position+nut_width+x_3} {y_2} " + \
-            f"L {position+nut_width+x_2} {y_2} " + \
-            f"L {position+nut_width+x_2} {y_0} Z "
-        cutb = align_joint(cutb, lengthb, thickness, alignment)
-        cuts[faceb].append(place_new_edge_path(cutb, pathb))
+            cutb_parts.append(f"M {position+segment_length:.3f} 0 "
+                              f"L {position+segment_length:.3f} {thickness:.3f} "
+                              f"L {position+segment_length+bolt_space:.3f} {thickness:.3f} "
+                              f"L {position+segment_length+bolt_space:.3f} 0 Z")
+        cutb_parts.append(get_tslot_path(position+nut_width,
+                                         (x_0, x_1, x_2, x_3),
+                                         (y_0, y_2, y_3, y_4)))
         position = position + bolt_space + segment_length
+    cutb = align_joint(" ".join(cutb_parts), lengthb, thickness, alignment)
+    cuts[faceb] = divide_pathstring_parts(apply_edge_transform(cutb, transform_b))
 
     #cutb = f"M {lengt} {0} L {0} {thickness} L {buffer_size_b} {thickness} L {buffer_size_b} {0} Z"
 
@@ -576,76 +684,62 @@ def get_bolt_joint_cuts(joint, _, parameters):
 
 def get_tslot_joint_adds(joint, _, parameters):
     """generator for tslot joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     # https://docs.google.com/spreadsheets/d/1WmfN8BqZF7OF0b_wrQmnSpbe4QhH35GthL3uRCC2ex8/edit#gid=0
     adds = {}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    adda = f"M {0} {thickness} "+f"L {0} {-thickness} " + \
-        f"L {lengtha} {-thickness} "+f"L {lengtha} {thickness}"
-    addb = f"M {0} {0} "+f"L {0} {thickness} " + \
-        f"L {lengthb} {thickness} "+f"L {lengthb} {0}"
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    adda = f"M 0 {thickness:.3f} L 0 {-thickness:.3f} " \
+        f"L {lengtha:.3f} {-thickness:.3f} L {lengtha:.3f} {thickness:.3f}"
+    addb = f"M 0 0 L 0 {thickness:.3f} " \
+        f"L {lengthb:.3f} {thickness:.3f} L {lengthb:.3f} 0"
 
     adda = align_joint(adda, lengtha, thickness, alignment)
     addb = align_joint(addb, lengthb, thickness, alignment)
 
-    adds[facea] = [place_new_edge_path(adda, patha)]
-    adds[faceb] = [place_new_edge_path(addb, pathb)]
+    adds[facea] = [apply_edge_transform(adda, transform_a)]
+    adds[faceb] = [apply_edge_transform(addb, transform_b)]
 
     return adds
 
 
 def get_tslot_joint_cuts(joint, _, parameters):
     """generator for tslot joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
 
-    nut_bolt_sizes = {'M2': {'nut_width': 3.3,
-                             'nut_height': 2.0,
-                             'bolt_diameter': 2},
-                      'M2.5': {'nut_width': 4.3,
-                               'nut_height': 2.0,
-                               'bolt_diameter': 2.5},
-                      'M3': {'nut_width': 5.5,
-                             'nut_height': 2.0,
-                             'bolt_diameter': 3.0},
-                      'M4': {'nut_width': 7.0,
-                             'nut_height': 2.0,
-                             'bolt_diameter': 4.0}}
-    clearance = 0.1
-
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    bolt_size = joint['joint_parameters']['boltsize']
-    bolt_space = joint['joint_parameters']['boltspace']
-    bolt_num = joint['joint_parameters']['boltnum']
-    bolt_length = joint['joint_parameters']['boltlength']
-
-    nut_width = nut_bolt_sizes[bolt_size]['nut_width'] + clearance
-    nut_height = nut_bolt_sizes[bolt_size]['nut_height'] + clearance
-    bolt_diameter = nut_bolt_sizes[bolt_size]['bolt_diameter'] + clearance
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    bolt_size = joint_params.boltsize
+    bolt_space = joint_params.boltspace
+    bolt_num = joint_params.boltnum
+    bolt_length = joint_params.boltlength
+
+    nut_width = NUT_BOLT_SIZES[bolt_size]['nut_width'] + NUT_BOLT_CLEARANCE
+    nut_height = NUT_BOLT_SIZES[bolt_size]['nut_height'] + NUT_BOLT_CLEARANCE
+    bolt_diameter = NUT_BOLT_SIZES[bolt_size]['bolt_diameter'] + NUT_BOLT_CLEARANCE
 
     segment_length = nut_width * 3
     combined_length = bolt_num * segment_length + \
@@ -664,351 +758,321 @@ def get_tslot_joint_cuts(joint, _, parameters):
     y_3 = bolt_length - nut_height
     y_4 = bolt_length
 
-    cuts[facea] = []
-    # cuta = f""
+    # every fragment is placed in one go, then split back into separate paths
+    cuta_parts = []
     position = buffer_size_a
     for _ in range(bolt_num):
-        cuta = f"M {position+nut_width+x_1} {thickness/2} " + \
-            f"A {bolt_diameter/2} {bolt_diameter/2} 0 0 1 " + \
-            f"{position+nut_width+x_1 + bolt_diameter} {thickness/2} " + \
-            f"M {position+nut_width+x_1 + bolt_diameter} {thickness/2} " + \
-            f"A {bolt_diameter/2} {bolt_diameter/2} 0 0 1 " + \
-            f"{position+nut_width+x_1} {thickness/2} "
-        cuta = align_joint(cuta, lengtha, thickness, alignment)
-        cuts[facea].append(place_new_edge_path(cuta, patha))
+        cuta_parts.append(f"M {position+nut_width+x_1:.3f} {thickness/2:.3f} "
+                          f"A {bolt_diameter/2:.3f} {bolt_diameter/2:.3f} 0 0 1 "
+                          f"{position+nut_width+x_1 + bolt_diameter:.3f} {thickness/2:.3f} "
+                          f"M {position+nut_width+x_1 + bolt_diameter:.3f} {thickness/2:.3f} "
+                          f"A {bolt_diameter/2:.3f} {bolt_diameter/2:.3f} 0 0 1 "
+                          f"{position+nut_width+x_1:.3f} {thickness/2:.3f}")
         position = position + bolt_space + segment_length
+    cuta = align_joint(" ".join(cuta_parts), lengtha, thickness, alignment)
+    cuts[facea] = divide_pathstring_parts(apply_edge_transform(cuta, transform_a))
 
-    # cuta += f"M {position} {0} " + \
-    #         f"L {position} {thickness} " + \
-    #         f"L {position+nut_width} {thickness} " + \
-    #         f"L {position+nut_width} {0} Z "
-    cuts[faceb] = []
-    # cuta = f""
-
+    cutb_parts = []
     position = buffer_size_b
     for bolt in range(bolt_num):
-        cutb = f"M {position+nut_width+x_1} {y_0} " + \
-            f"L {position+nut_width+x_1} {y_2} " + \
-            f"L {position+nut_width+x_0} {y_2} " + \
-            f"L {position+nut_width+x_0} {y_3} " + \
-            f"L {position+nut_width+x_1} {y_3} " + \
-            f"L {position+nut_width+x_1} {y_4} " + \
-            f"L {position+nut_width+x_2} {y_4} " + \
-            f"L {position+nut_width+x_2} {y_3} " + \
-            f"L {position+nut_width+x_3} {y_3} " + \
-            f"L {position+nut_width+x_3} {y_2} " + \
-            f"L {position+nut_width+x_2} {y_2} " + \
-            f"L {position+nut_width+x_2} {y_0} Z "
-        cutb = align_joint(cutb, lengthb, thickness, alignment)
-        cuts[faceb].append(place_new_edge_path(cutb, pathb))
+        cutb_parts.append(get_tslot_path(position+nut_width,
+                                         (x_0, x_1, x_2, x_3),
+                                         (y_0, y_2, y_3, y_4)))
         position = position + bolt_space + segment_length
-
-    #cutb = f"M {lengt} {0} L {0} {thickness} L {buffer_size_b} {thickness} L {buffer_size_b} {0} Z"
-
-    # cuts[facea] = [place_new_edge_path(cuta, patha)]
-    # cuts[faceb] = [place_new_edge_path(cutb, pathb)]
+    cutb = align_joint(" ".join(cutb_parts), lengthb, thickness, alignment)
+    cuts[faceb] = divide_pathstring_parts(apply_edge_transform(cutb, transform_b))
 
     return cuts
 
 
 def get_tabslot_joint_adds(joint, _, parameters):
     """generator for tabslot joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     adds = {}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    adda = f"M {0} {thickness} "+f"L {0} {-thickness} " + \
-        f"L {lengtha} {-thickness} "+f"L {lengtha} {thickness}"
-    addb = f"M {0} {0} "+f"L {0} {thickness} " + \
-        f"L {lengthb} {thickness} " + f"L {lengthb} {0}"
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    adda = f"M 0 {thickness:.3f} L 0 {-thickness:.3f} " \
+        f"L {lengtha:.3f} {-thickness:.3f} L {lengtha:.3f} {thickness:.3f}"
+    addb = f"M 0 0 L 0 {thickness:.3f} " \
+        f"L {lengthb:.3f} {thickness:.3f} L {lengthb:.3f} 0"
 
     adda = align_joint(adda, lengtha, thickness, alignment)
     addb = align_joint(addb, lengthb, thickness, alignment)
 
-    adds[facea] = [place_new_edge_path(adda, patha)]
-    adds[faceb] = [place_new_edge_path(addb, pathb)]
+    adds[facea] = [apply_edge_transform(adda, transform_a)]
+    adds[faceb] = [apply_edge_transform(addb, transform_b)]
 
     return adds
 
 
 def get_tabslot_joint_cuts(joint, _, parameters):
     """generator for tabslot joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
-    angle = joint['joint_parameters']['angle']
+    angle = joint_params.angle
     thickness = parameters.thickness * math.sin(angle)
 
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    tabsize = joint['joint_parameters']['tabsize']
-    tabspace = joint['joint_parameters']['tabspace']
-    tabnum = joint['joint_parameters']['tabnum']
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    tabsize = joint_params.tabsize
+    tabspace = joint_params.tabspace
+    tabnum = joint_params.tabnum
     thickness = parameters.thickness - \
         parameters.get_fit('tab', 'Clearance') #TODO: why?
-    fit = parameters.get_fit('tab', joint['joint_parameters']['fit'])
-    alignment = joint['joint_parameters']['joint_align']
+    fit = parameters.get_fit('tab', joint_params.fit)
+    alignment = joint_params.joint_align
 
     sega = tabsize*tabnum + tabspace*(tabnum-1) - fit
     segb = tabsize*tabnum + tabspace*(tabnum-1) + fit
     offseta = (lengtha - sega) / 2.0
     offsetb = (lengthb - segb) / 2.0
 
-    cuta = f""
-    position = offseta
-    for _ in range(tabnum):
-        cuta += f"M {position} {0} " + \
-                f"L {position} {thickness}" + \
-                f"L {position + tabsize - fit} {thickness}" + \
-                f"L {position + tabsize - fit} {0} Z "
-        position = position + tabsize+tabspace
-
-    cutb = f"M {0} {0} " + f"L {0} {thickness} " + \
-           f"L {offsetb} {thickness} " + f"L {offsetb} {0} Z "
-    position = offsetb
     step = tabsize + tabspace
-    for _ in range(tabnum - 1):
-        cutb += f"M {position+tabsize+fit} {0} " + f"L {position+tabsize+fit} {thickness} " + \
-                f"L {position+tabsize+tabspace} {thickness} " + \
-                f"L {position+tabsize+tabspace} {0} Z "
-        position = position + step
-    position = position + tabsize
-    cutb += f"M {position+fit} {0} " + f"L {position+fit} {thickness} " + \
-            f"L {lengthb} {thickness} " + f"L {lengthb} {0} Z "
+    tab_starts = offseta + np.arange(tabnum) * step
+    tab_ends = tab_starts + tabsize - fit
+    cuta_parts = []
+    for start, end in zip(tab_starts.tolist(), tab_ends.tolist()):
+        cuta_parts.append(f"M {start:.3f} 0 "
+                          f"L {start:.3f} {thickness:.3f}"
+                          f"L {end:.3f} {thickness:.3f}"
+                          f"L {end:.3f} 0 Z")
+    cuta = " ".join(cuta_parts)
+
+    gap_positions = offsetb + np.arange(max(tabnum - 1, 0)) * step
+    gap_starts = gap_positions + tabsize + fit
+    gap_ends = gap_positions + tabsize + tabspace
+    cutb_parts = [f"M 0 0 L 0 {thickness:.3f} "
+                  f"L {offsetb:.3f} {thickness:.3f} L {offsetb:.3f} 0 Z"]
+    for start, end in zip(gap_starts.tolist(), gap_ends.tolist()):
+        cutb_parts.append(f"M {start:.3f} 0 L {start:.3f} {thickness:.3f} "
+                          f"L {end:.3f} {thickness:.3f} "
+                          f"L {end:.3f} 0 Z")
+    position = offsetb + max(tabnum - 1, 0) * step + tabsize
+    cutb_parts.append(f"M {position+fit:.3f} 0 L {position+fit:.3f} {thickness:.3f} "
+                      f"L {lengthb:.3f} {thickness:.3f} L {lengthb:.3f} 0 Z")
+    cutb = " ".join(cutb_parts)
 
     cuta = align_joint(cuta, lengtha, thickness, alignment)
     cutb = align_joint(cutb, lengthb, thickness, alignment)
 
-    cuts[facea] = [place_new_edge_path(cuta, patha)]
-    cuts[faceb] = [place_new_edge_path(cutb, pathb)]
+    cuts[facea] = [apply_edge_transform(cuta, transform_a)]
+    cuts[faceb] = [apply_edge_transform(cutb, transform_b)]
 
     return cuts
 
 
 def get_interlock_joint_adds(joint, _, parameters):
     """generator for interlock joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     adds = {}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    alignment = joint['joint_parameters']['joint_align']
-
-    adda = f"M {0} {thickness} "+f"L {0} {-thickness} " + \
-        f"L {lengtha} {-thickness} "+f"L {lengtha} {thickness}"
-    addb = f"M {0} {thickness} "+f"L {0} {-thickness} " + \
-        f"L {lengthb} {-thickness} " + f"L {lengthb} {thickness}"
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    alignment = joint_params.joint_align
+
+    adda = f"M 0 {thickness:.3f} L 0 {-thickness:.3f} " \
+        f"L {lengtha:.3f} {-thickness:.3f} L {lengtha:.3f} {thickness:.3f}"
+    addb = f"M 0 {thickness:.3f} L 0 {-thickness:.3f} " \
+        f"L {lengthb:.3f} {-thickness:.3f} L {lengthb:.3f} {thickness:.3f}"
 
     adda = align_joint(adda, lengtha, thickness, alignment)
     addb = align_joint(addb, lengthb, thickness, alignment)
 
-    adds[facea] = [place_new_edge_path(adda, patha)]
-    adds[faceb] = [place_new_edge_path(addb, pathb)]
+    adds[facea] = [apply_edge_transform(adda, transform_a)]
+    adds[faceb] = [apply_edge_transform(addb, transform_b)]
 
     return adds
 
 
 def get_interlock_joint_cuts(joint, _, parameters):
     """generator for interlock joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    if thickness > 4.5:
-        fits = {'Wood': {'Clearance': -0.05, 'Friction': 0.05, 'Press': 0.075},
-                'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
-                'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
-    else:
-        fits = {
-            'Wood': {'Clearance': -0.05, 'Friction': 0.04, 'Press': 0.05},
-            'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
-            'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    fits = FITS_THICK if thickness > 4.5 else FITS_THIN
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
     joint_length = min(lengtha, lengthb)
     cut_length = joint_length / 2
     # thickness = parameters.thickness
-    alignment = joint['joint_parameters']['joint_align']
-    fit = fits[parameters['material']][joint['joint_parameters']['fit']]
-
-    cuta = f""
-
-    cuta += f"M {0} {0} " + \
-            f"L {0} {thickness-fit}" + \
-            f"L {cut_length} {thickness-fit}" + \
-            f"L {cut_length} {0} Z "
-
-    cutb = f"M {0} {0} " + \
-           f"L {0} {thickness-fit}" + \
-           f"L {cut_length} {thickness-fit}" + \
-           f"L {cut_length} {0} Z "
+    alignment = joint_params.joint_align
+    fit = fits[parameters['material']][joint_params.fit]
+
+    cuta = "M 0 0 " \
+           f"L 0 {thickness-fit:.3f}" \
+           f"L {cut_length:.3f} {thickness-fit:.3f}" \
+           f"L {cut_length:.3f} 0 Z "
+
+    cutb = "M 0 0 " \
+           f"L 0 {thickness-fit:.3f}" \
+           f"L {cut_length:.3f} {thickness-fit:.3f}" \
+           f"L {cut_length:.3f} 0 Z "
     cuta = align_joint(cuta, lengtha, thickness, alignment)
     cutb = align_joint(cutb, lengthb, thickness, alignment)
 
-    cuts[facea] = [place_new_edge_path(cuta, patha)]
-    cuts[faceb] = [place_new_edge_path(cutb, pathb)]
+    cuts[facea] = [apply_edge_transform(cuta, transform_a)]
+    cuts[faceb] = [apply_edge_transform(cutb, transform_b)]
 
     return cuts
 
 
-def get_joint_adds(joint, model, parameters):
-    """process a single joint"""
-    jointtype = joint['joint_parameters']['joint_type']
-    addfunc = {'Box': get_box_joint_adds,
-               'Tab-and-Slot': get_tabslot_joint_adds,
-               'Interlocking': get_interlock_joint_adds,
-               'Bolt': get_bolt_joint_adds,
-               'TSlot': get_tslot_joint_adds,
-               'Slotted': get_slotted_joint_adds}
-    adds = addfunc.get(jointtype, lambda j, m, c: {})(joint, model, parameters)
-    return adds
-
-
-def get_joint_cuts(joint, model, parameters):
-    """process a single joint"""
-    jointtype = joint['joint_parameters']['joint_type']
-    cutfunc = {'Box': get_box_joint_cuts,
-               'Tab-and-Slot': get_tabslot_joint_cuts,
-               'Interlocking': get_interlock_joint_cuts,
-               'Bolt': get_bolt_joint_cuts,
-               'Divider': get_divider_joint_cuts,
-               'Flat': get_flat_joint_cuts,
-               'TSlot': get_tslot_joint_cuts,
-               'Slotted': get_slotted_joint_cuts}
-    cuts = cutfunc.get(jointtype, lambda j, m, c: {})(joint, model, parameters)
-    return cuts
-
-
 def get_divider_joint_cuts(joint, _, parameters):
     """generator for divider joints"""
+    joint_params = joint['joint_parameters']
+    edge_a, edge_b = joint['edge_a'], joint['edge_b']
     cuts = {}
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    if thickness > 4.5:
-        fits = {'Wood': {'Clearance': -0.05, 'Friction': 0.05, 'Press': 0.075},
-                'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
-                'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
-    else:
-        fits = {
-            'Wood': {'Clearance': -0.05, 'Friction': 0.04, 'Press': 0.05},
-            'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
-            'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
-    patha = joint['edge_a']['d']
-    pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
-    faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    lengthb = get_length(pathb)
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    fits = FITS_THICK if thickness > 4.5 else FITS_THIN
+    patha = edge_a['d']
+    pathb = edge_b['d']
+    facea = edge_a['face']
+    faceb = edge_b['face']
+    lengtha = joint['length_a']
+    lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
+    transform_b = get_edge_transform(pathb)
     joint_length = min(lengtha, lengthb)
     cut_length = joint_length / 2
     # thickness = parameters.thickness
-    alignment = joint['joint_parameters']['joint_align']
-    fit = fits[parameters['material']][joint['joint_parameters']['fit']]
-
-    cuta = f""
-
-    cuta += f"M {0} {-(thickness-fit)} " + \
-            f"L {0} {thickness-fit}" + \
-            f"L {cut_length} {thickness-fit}" + \
-            f"L {cut_length} {-(thickness-fit)} Z "
-
-    cutb = f"M {0} {-(thickness-fit)/2} " + \
-           f"L {0} {(thickness-fit)/2}" + \
-           f"L {cut_length} {(thickness-fit)/2}" + \
-           f"L {cut_length} {-(thickness-fit)/2} Z "
+    alignment = joint_params.joint_align
+    fit = fits[parameters['material']][joint_params.fit]
+
+    cuta = f"M 0 {-(thickness-fit):.3f} " \
+           f"L 0 {thickness-fit:.3f}" \
+           f"L {cut_length:.3f} {thickness-fit:.3f}" \
+           f"L {cut_length:.3f} {-(thickness-fit):.3f} Z "
+
+    cutb = f"M 0 {-(thickness-fit)/2:.3f} " \
+           f"L 0 {(thickness-fit)/2:.3f}" \
+           f"L {cut_length:.3f} {(thickness-fit)/2:.3f}" \
+           f"L {cut_length:.3f} {-(thickness-fit)/2:.3f} Z "
     # cuta = align_joint(cuta, lengtha, thickness, alignment)
     # cutb = align_joint(cutb, lengthb, thickness, alignment)
 
-    cuts[facea] = [place_new_edge_path(cuta, patha)]
-    cuts[faceb] = [place_new_edge_path(cutb, pathb)]
+    cuts[facea] = [apply_edge_transform(cuta, transform_a)]
+    cuts[faceb] = [apply_edge_transform(cutb, transform_b)]
 
     return cuts
 
 
 def get_flat_joint_cuts(joint, _, parameters):
     """generator for flat joints"""
+    joint_params = joint['joint_parameters']
+    edge_a = joint['edge_a']
     cuts = {}
     cuts = {}
-    angle = joint['joint_parameters']['angle']
-    thickness = parameters.thickness
-    if angle < math.pi / 2:
-        thickness = thickness * math.tan(math.pi / 2 - angle) + thickness / math.cos(math.pi / 2 - angle)
-    else:
-        thickness = thickness * math.sin(angle)
-    if thickness > 4.5:
-        fits = {'Wood': {'Clearance': -0.05, 'Friction': 0.05, 'Press': 0.075},
-                'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
-                'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
-    else:
-        fits = {
-            'Wood': {'Clearance': -0.05, 'Friction': 0.04, 'Press': 0.05},
-            'None': {'Clearance': 0.0, 'Friction': 0.0, 'Press': 0.0},
-            'Acrylic': {'Clearance': -0.1, 'Friction': 0.0, 'Press': 0.0}}
-    patha = joint['edge_a']['d']
+    angle = joint_params.angle
+    thickness = effective_thickness(parameters.thickness, angle)
+    fits = FITS_THICK if thickness > 4.5 else FITS_THIN
+    patha = edge_a['d']
     # pathb = joint['edge_b']['d']
-    facea = joint['edge_a']['face']
+    facea = edge_a['face']
     # faceb = joint['edge_b']['face']
-    lengtha = get_length(patha)
-    # lengthb = get_length(pathb)
+    lengtha = joint['length_a']
+    # lengthb = joint['length_b']
+    transform_a = get_edge_transform(patha)
     # thickness = parameters.thickness
-    alignment = joint['joint_parameters']['joint_align']
+    alignment = joint_params.joint_align
     fit = fits[parameters['material']]['Clearance']
 
     # cuta = f""
 
-    cuta = f"M {0} {-(thickness-fit)} " + \
-           f"L {0} {thickness-fit}" + \
-           f"L {lengtha} {thickness-fit}" + \
-           f"L {lengtha} {-(thickness-fit)} Z "
+    cuta = f"M 0 {-(thickness-fit):.3f} " \
+           f"L 0 {thickness-fit:.3f}" \
+           f"L {lengtha:.3f} {thickness-fit:.3f}" \
+           f"L {lengtha:.3f} {-(thickness-fit):.3f} Z "
     # cuta = align_joint(cuta, lengtha, thickness, alignment)
     # cutb = align_joint(cutb, lengthb, thickness, alignment)
 
-    cuts[facea] = [place_new_edge_path(cuta, patha)]
+    cuts[facea] = [apply_edge_transform(cuta, transform_a)]
     print(cuts[facea])
     # cuts[faceb] = [place_new_edge_path(cutb, pathb)]
     return cuts
 
 
+def empty_joint(joint, model, parameters):
+    """generator for joint types that add or cut nothing"""
+    return {}
+
+
+JOINT_ADD_GENERATORS = {'Box': get_box_joint_adds,
+                        'Tab-and-Slot': get_tabslot_joint_adds,
+                        'Interlocking': get_interlock_joint_adds,
+                        'Bolt': get_bolt_joint_adds,
+                        'TSlot': get_tslot_joint_adds,
+                        'Slotted': get_slotted_joint_adds}
+
+JOINT_CUT_GENERATORS = {'Box': get_box_joint_cuts,
+                        'Tab-and-Slot': get_tabslot_joint_cuts,
+                        'Interlocking': get_interlock_joint_cuts,
+                        'Bolt': get_bolt_joint_cuts,
+                        'Divider': get_divider_joint_cuts,
+                        'Flat': get_flat_joint_cuts,
+                        'TSlot': get_tslot_joint_cuts,
+                        'Slotted': get_slotted_joint_cuts}
+
+
+def get_joint_adds(joint, model, parameters):
+    """process a single joint"""
+    jointtype = joint['joint_parameters'].joint_type
+    adds = JOINT_ADD_GENERATORS.get(jointtype, empty_joint)(joint, model, parameters)
+    return adds
+
+
+def get_joint_cuts(joint, model, parameters):
+    """process a single joint"""
+    jointtype = joint['joint_parameters'].joint_type
+    cuts = JOINT_CUT_GENERATORS.get(jointtype, empty_joint)(joint, model, parameters)
+    return cuts
+
+
 def align_joint(path, length, thickness, alignment):
     """returns joint offset inside, middle, or balanced"""
-    new_path = path
-    alignment_path = {
-        'Inside': f"M {0} {0} L {length} {0}",
-        'Middle': f"M {0} {-thickness/2.0} L {length} {-thickness/2.0}",
-        'Outside': f"M {0} {-thickness} L {length} {-thickness}", }
-    new_path = place_new_edge_path(path, alignment_path[alignment])
+    # only the chosen alignment's edge is formatted
+    if alignment == 'Inside':
+        alignment_path = f"M 0 0 L {length} 0"
+    elif alignment == 'Middle':
+        alignment_path = f"M 0 {-thickness/2.0} L {length} {-thickness/2.0}"
+    elif alignment == 'Outside':
+        alignment_path = f"M 0 {-thickness} L {length} {-thickness}"
+    else:
+        raise ValueError(f"unknown joint alignment {alignment!r}")
+    new_path = place_new_edge_path(path, alignment_path)
     return new_path
 
 
@@ -1016,13 +1080,13 @@ def kerf_offset(model, parameters):
     """Applies a kerf offset based upon material and laser parameters"""
     kerf_size = parameters.kerf
     original_tree = model['tree']
+    faces = [face for face in original_tree if face.startswith('face')]
+    face_loops = [get_face_loops(original_tree[face]) for face in faces]
+    kerf_loops = get_offset_loops(face_loops, kerf_size)
     tree = {}
-    for face, shapes in original_tree.items():
-        if face.startswith('face'):
-            original = shapes['paths']
-            kerf_path = get_kerf(original, kerf_size)
-            tree[face] = {
-                'paths': kerf_path}
+    for face, loops in zip(faces, kerf_loops):
+        tree[face] = {
+            'paths': loops_to_paths(loops)}
 
     return tree
 
@@ -1041,110 +1105,94 @@ def get_processed_model(model, parameters):
     return output_model
 
 
-def get_kerf(paths, kerf_size):
-    """calculate kerf compensated path using PyClipper"""
-    # PyClipper understands loops not paths
-    loops = paths_to_loops(paths)
-    kerf_loops = get_offset_loop(loops, kerf_size)
-    # change back into paths for output
-    kerf_paths = loops_to_paths(kerf_loops)
-    return kerf_paths
+def get_face_kerfs(original, processed, slow_kerf_size, fast_kerf_size):
+    """returns visible and hidden kerf compensated paths of one face"""
+    # PyClipper understands loops not paths, so parse each face once for both kerfs
+    original_loops = paths_to_loops(original)
+    processed_loops = paths_to_loops(processed)
 
+    original_kerf = loops_to_paths(get_offset_loop(original_loops, slow_kerf_size))
+    processed_kerf = loops_to_paths(get_offset_loop(processed_loops, slow_kerf_size))
+    outside_kerf = get_overlapping(processed_kerf, original_kerf)
+    # outside_kerf = intersect_paths(processed_kerf, original_kerf)
 
-def get_outside_kerf(tree, parameters):
-    """calculate kerf compensated path for visible surfaces"""
-    slow_kerf_size = parameters['slow_kerf']
-    visible_style = f"fill:none;stroke:#ff0000;stroke-linejoin:round;" + \
-        f"stroke-width:{slow_kerf_size}px;stroke-linecap:round;stroke-opacity:0.5"
+    if fast_kerf_size != slow_kerf_size:
+        original_kerf = loops_to_paths(get_offset_loop(original_loops, fast_kerf_size))
+        processed_kerf = loops_to_paths(get_offset_loop(processed_loops, fast_kerf_size))
+    # inside_kerf = subtract_paths(processed_kerf, original_kerf)
+    inside_kerf = get_not_overlapping(processed_kerf, original_kerf)
+    return outside_kerf, inside_kerf
 
-    for face, shapes in tree.items():
-        if face.startswith('Face'):
-            original = shapes['Original']['paths']
-            processed = shapes['Processed']['paths']
-            original_kerf = get_kerf(original, parameters['slow_kerf'])
-            processed_kerf = get_kerf(processed, parameters['slow_kerf'])
-            outside_kerf = get_overlapping(processed_kerf, original_kerf)
-            # outside_kerf = intersect_paths(processed_kerf, original_kerf)
-            tree[face]['Visible'] = {
-                'paths': outside_kerf,
-                'style': visible_style}
-    return tree
 
-
-def get_inside_kerf(tree, parameters):
-    """calculate kerf compensated path for non-visible surfaces"""
+# not wired up yet: nothing in the pipeline builds the 'Face' trees this expects
+def get_kerfs(tree, parameters):
+    """calculate kerf compensated paths for visible and non-visible surfaces"""
+    slow_kerf_size = parameters['slow_kerf']
     fast_kerf_size = parameters['fast_kerf']
+    visible_style = f"fill:none;stroke:#ff0000;stroke-linejoin:round;" + \
+        f"stroke-width:{slow_kerf_size}px;stroke-linecap:round;stroke-opacity:0.5"
     inside_style = f"fill:none;stroke:#0000ff;stroke-linejoin:round;" + \
         f"stroke-width:{fast_kerf_size}px;stroke-linecap:round;stroke-opacity:0.5"
 
-    for face, shapes in tree.items():
-        if face.startswith('Face'):
-            original = shapes['Original']['paths']
-            processed = shapes['Processed']['paths']
-            original_kerf = get_kerf(original, parameters['fast_kerf'])
-            processed_kerf = get_kerf(processed, parameters['fast_kerf'])
-            # inside_kerf = subtract_paths(processed_kerf, original_kerf)
-            inside_kerf = get_not_overlapping(processed_kerf, original_kerf)
-            tree[face]['Hidden'] = {
-                'paths': inside_kerf,
-                'style': inside_style}
+    # faces take milliseconds each, so they are kerfed in turn rather than in a pool
+    faces = [face for face in tree if face.startswith('Face')]
+    face_kerfs = [get_face_kerfs(tree[face]['Original']['paths'],
+                                 tree[face]['Processed']['paths'],
+                                 slow_kerf_size, fast_kerf_size)
+                  for face in faces]
+
+    for face, (outside_kerf, inside_kerf) in zip(faces, face_kerfs):
+        tree[face]['Visible'] = {
+            'paths': outside_kerf,
+            'style': visible_style}
+        tree[face]['Hidden'] = {
+            'paths': inside_kerf,
+            'style': inside_style}
     return tree
 
 
 def scale_viewbox(viewbox, scale):
     """scale viewbox(string of 4 numbers) by scale factor (float)"""
-    new_viewbox = ""
-    for coord in viewbox.split():
-        new_viewbox += f"{float(coord) * scale} "
-    # print(viewbox.split())
-    new_viewbox = new_viewbox.strip()
+    coords = np.array(viewbox.split(), dtype=float) * scale
+    new_viewbox = " ".join(str(coord) for coord in coords.tolist())
     return new_viewbox
 
 
 def scale_tree(tree, scale):
-    """scale model"""
-    new_tree = tree
+    """scale model faces in place"""
     for face, shapes in tree.items():
         if face.startswith('face'):
-            for layer, contents in shapes.items():
-                scaled_paths = []
-                for path in contents['paths']:
-                    scaled_path = scale_path(path, scale)
-                    scaled_paths.append(scaled_path)
-                new_tree[face][layer]['paths'] = scaled_paths
-    return new_tree
+            for contents in shapes.values():
+                contents['paths'] = [scale_path(path, scale) for path in contents['paths']]
+    return tree
 
 
 def scale_joint_params(params, scale):
-    """modify scalable joint parameters"""
-    new_params = params
-    new_params['tabsize'] = params['tabsize'] * scale
-    new_params['tabspace'] = params['tabspace'] * scale
-    new_params['boltspace'] = params['boltspace'] * scale
+    """modify scalable joint parameters in place"""
+    params['tabsize'] *= scale
+    params['tabspace'] *= scale
+    params['boltspace'] *= scale
     return params
 
 
 def scale_joints(joints, scale):
-    """scale joints(edges and parameters) by scale factor (float)"""
-    scaled_joints = joints
-    for joint, specs in joints.items():
-        scaled_joints[joint]['edge_a']['d'] = scale_path(
-            specs['edge_a']['d'], scale)
-        scaled_joints[joint]['edge_b']['d'] = scale_path(
-            specs['edge_b']['d'], scale)
-        scaled_joints[joint]['joint_parameters'] = scale_joint_params(
-            specs['joint_parameters'], scale)
-    return scaled_joints
+    """scale joints(edges and parameters) in place by scale factor (float)"""
+    for specs in joints.values():
+        edge_a = specs['edge_a']
+        edge_a['d'] = scale_path(edge_a['d'], scale)
+        edge_b = specs['edge_b']
+        edge_b['d'] = scale_path(edge_b['d'], scale)
+        scale_joint_params(specs['joint_parameters'], scale)
+    return joints
 
 
 def scale_design(design_model, scale):
-    """scales design by factor(float)"""
-    scaled_model = design_model
-    scaled_model['attrib']['viewBox'] = scale_viewbox(
-        design_model['attrib']['viewBox'], scale)
-    scaled_model['tree'] = scale_tree(design_model['tree'], scale)
-    scaled_model['joints'] = scale_joints(design_model['joints'], scale)
-    return scaled_model
+    """scales design in place by factor(float)"""
+    attrib = design_model['attrib']
+    attrib['viewBox'] = scale_viewbox(attrib['viewBox'], scale)
+    scale_tree(design_model['tree'], scale)
+    scale_joints(design_model['joints'], scale)
+    return design_model
 
 
 def process_web_outputsvg(design_model, parameters):
@@ -1179,16 +1227,20 @@ def svg_to_model(filename):
 
 def extract_embeded_model(filename):
     """extracts embeded model if there is one in metadata"""
-    model = None
-    tree = ET.parse(filename)
-    root = tree.getroot()
-
-    for metadata in root.findall('{http://www.w3.org/2000/svg}metadata'):
-        lasermetadata = metadata.find(
-            '{http://www.w3.org/2000/svg}laserassistant')
-        if lasermetadata is not None:
-            model = json.loads(lasermetadata.attrib['model'])
-    return model
+    # stream the svg and stop at the model instead of building the whole tree
+    model_path = ['{http://www.w3.org/2000/svg}metadata',
+                  '{http://www.w3.org/2000/svg}laserassistant']
+    tags = []
+    with open(filename, 'rb') as svgfile:
+        for event, elem in ET.iterparse(svgfile, events=('start', 'end')):
+            if event == 'start':
+                tags.append(elem.tag)
+                if tags[1:] == model_path:
+                    return json.loads(elem.attrib['model'])
+            else:
+                tags.pop()
+                elem.clear()
+    return None
 
 
 def model_from_raw_svg(filename):
@@ -1232,13 +1284,10 @@ def get_edges(model):
 def add_joints(model):
     """adds joints to tree"""
     tree = model['tree']
-    joints = model['joints']
-    for joint in joints:
-        new_edge = {"paths": [joints[joint]['path']]}
-        if 'Joints' not in tree[joints[joint]['face']]:
-            tree[joints[joint]['face']]['Joints'] = {}
-        tree[joints[joint]['face']]['Joints'][joint] = new_edge
-    model['tree'] = tree
+    for joint, specs in model['joints'].items():
+        new_edge = {"paths": [specs['path']]}
+        face_shapes = tree[specs['face']]
+        face_shapes.setdefault('Joints', {})[joint] = new_edge
     return model
 
 
@@ -1253,13 +1302,17 @@ def paths_to_faces(paths):
     """takes a list of paths and returns model with faces"""
     model = make_blank_model()
     perims, cuts = separate_perims_from_cuts(paths)
+    # parse each cut once instead of once per perimeter
+    cut_loops = paths_to_loops(cuts)
+    cut_boxes = [get_bounding_box(cut_loop) for cut_loop in cut_loops]
 
     for index, perim in enumerate(perims):
+        perim_loop = paths_to_loops([perim])[0]
+        perim_box = get_bounding_box(perim_loop)
+        face_cuts = [cut for cut, cut_loop, cut_box in zip(cuts, cut_loops, cut_boxes)
+                     if loop_inside_loop(cut_loop, perim_loop, cut_box, perim_box)]
         model['tree'][f"face{index+1}"] = {
-            "Perimeter": {'paths': [perim]}, "Cuts": {'paths': []}}
-        for cut in cuts:
-            if is_inside(cut, perim):
-                model['tree'][f"face{index+1}"]['Cuts']['paths'].append(cut)
+            "Perimeter": {'paths': [perim]}, "Cuts": {'paths': face_cuts}}
 
     return model
 
@@ -12,12 +12,48 @@ def merge_loops(loops):
     """merges multiple loops into a union"""
     if len(loops) < 1:
         return (loops)
-    union = [loops[0]]
-    for loopindex in range(len(loops)):
-        union = get_union(union, [loops[loopindex]])
+    clipper = pyclipper.Pyclipper()  # pylint: disable=c-extension-no-member
+    scaled_loops = pyclipper.scale_to_clipper(loops, SCALING_FACTOR)
+    # with every loop wound the same way, one nonzero union covers all of them
+    # instead of unioning the loops in one at a time
+    oriented_loops = [loop if pyclipper.Orientation(loop) else loop[::-1]
+                      for loop in scaled_loops]
+
+    clipper.AddPaths(oriented_loops, pyclipper.PT_SUBJECT)
+    scaled_union = clipper.Execute(
+        pyclipper.CT_UNION, pyclipper.PFT_NONZERO, pyclipper.PFT_NONZERO)
+
+    union = pyclipper.scale_from_clipper(scaled_union, SCALING_FACTOR)
     return union
 
 
+def get_bounding_box(loop):
+    """returns the bounding box (min_x, min_y, max_x, max_y) of a loop"""
+    x_values = [point[0] for point in loop]
+    y_values = [point[1] for point in loop]
+    return (min(x_values), min(y_values), max(x_values), max(y_values))
+
+
+def boxes_overlap(first, second):
+    """True or False based upon if two bounding boxes overlap or touch"""
+    return (first[0] <= second[2] and second[0] <= first[2] and
+            first[1] <= second[3] and second[1] <= first[3])
+
+
+def split_overlapping(loops, others):
+    """splits loops into those whose bounding boxes overlap any of the other loops and those that don't"""
+    other_boxes = [get_bounding_box(other) for other in others]
+    overlapping = []
+    disjoint = []
+    for loop in loops:
+        box = get_bounding_box(loop)
+        if any(boxes_overlap(box, other_box) for other_box in other_boxes):
+            overlapping.append(loop)
+        else:
+            disjoint.append(loop)
+    return overlapping, disjoint
+
+
 def get_difference(first, second):
     """Takes two list of loops (list of (x,y) points), and returns the difference"""
     second = merge_loops(second)
@@ -95,6 +131,22 @@ def get_offset_loop(shape, offset_size):
     return offset
 
 
+def get_offset_loops(shapes, offset_size):
+    """takes a list of shapes (lists of loops), and returns each shape offset by a given size"""
+    # one offsetter is cleared and reused per shape; shapes are not offset
+    # together since clipper would merge results from overlapping shapes
+    offsetter = pyclipper.PyclipperOffset()
+    scaled_offset_size = offset_size * SCALING_FACTOR
+    offsets = []
+    for shape in shapes:
+        offsetter.Clear()
+        scaled_shape = pyclipper.scale_to_clipper(shape, SCALING_FACTOR)
+        offsetter.AddPaths(scaled_shape, pyclipper.JT_ROUND, pyclipper.PT_SUBJECT)
+        scaled_offset = offsetter.Execute(scaled_offset_size)
+        offsets.append(pyclipper.scale_from_clipper(scaled_offset, SCALING_FACTOR))
+    return offsets
+
+
 def point_inside_loop(point, loop):
     """tests to see if a point is inside (1), on(-1), or outside (0) of a loop"""
     scaled_loop = pyclipper.scale_to_clipper(loop, SCALING_FACTOR)
@@ -104,6 +156,20 @@ def point_inside_loop(point, loop):
     return is_point_inside
 
 
+def loop_inside_loop(loop, other_loop, box, other_box):
+    """True or False based upon if any point of a loop is inside (not on) another loop, given their bounding boxes"""
+    # a point strictly inside other_loop must also be within its bounding box
+    if not boxes_overlap(box, other_box):
+        return False
+    scaled_other_loop = pyclipper.scale_to_clipper(other_loop, SCALING_FACTOR)
+    for point in loop:
+        scaled_point = [int(point[0] * SCALING_FACTOR),
+                        int(point[1] * SCALING_FACTOR)]
+        if pyclipper.PointInPolygon(scaled_point, scaled_other_loop) == 1:
+            return True
+    return False
+
+
 def point_on_loops(point, loops):
     """True or False based upon if a point is on any loop in a list of loops."""
     for loop in loops:
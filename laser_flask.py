@@ -1,10 +1,14 @@
 """Flask server to host UI"""
 
 import json
+import tempfile
+from functools import lru_cache
+
+import orjson
 
 from flask_cors import CORS
 
-from flask import Flask, request, redirect, jsonify, url_for
+from flask import Flask, request, redirect, url_for, send_file
 
 from laser_assistant import (svg_to_model,
                              get_original_model, process_web_outputsvg, LaserParameters)
@@ -32,16 +36,9 @@ cors = CORS(app, resources={r"*": VUE_CLIENT})  # pylint: disable=invalid-name
 
 
 def get_svg_response(filename):
-    """returns a response with svg file"""
-    svgfile = open(filename, "r")
-    svgdata = svgfile.read()
-    svgfile.close()
-    response = app.response_class(
-        response=svgdata,
-        status=200,
-        mimetype='image/svg+xml'
-    )
-    return response
+    """returns a response streaming the svg file from disk"""
+    # send_file resolves relative names against the app root, not the cwd
+    return send_file(os.path.abspath(filename), mimetype='image/svg+xml')
 
 
 @app.route('/')
@@ -81,7 +78,7 @@ def load_presets():
 def get_design():
     """returns design.svg"""
     if request.method == 'POST':
-        model = json.loads(request.form['inputModel'])
+        model = orjson.loads(request.form['inputModel'])
         # params = json.loads(request.form['laserParams'])
         new_model = get_original_model(model)
         model_to_svg_file(new_model, design=model, filename="design.svg")
@@ -92,8 +89,8 @@ def get_design():
 def get_output():
     """returns output.svg"""
     if request.method == 'POST':
-        model = json.loads(request.form['inputModel'])
-        params = json.loads(request.form['laserParams'])
+        model = orjson.loads(request.form['inputModel'])
+        params = orjson.loads(request.form['laserParams'])
         print("Got parameters: ", params) #DEBUG
         params = LaserParameters(params)
         new_model = process_web_outputsvg(model, params)
@@ -101,15 +98,29 @@ def get_output():
     return get_svg_response('output.svg')
 
 
+@lru_cache(maxsize=16)
+def _svg_to_model_json(svg_input):
+    """returns the json model of an svg string, reusing models of svgs posted before"""
+    # each request parses its own file, so concurrent posts can't swap models
+    svg_file = tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False)
+    try:
+        with svg_file:
+            svg_file.write(svg_input)
+        # stored serialized, so later processing can't change the cached model
+        return orjson.dumps(svg_to_model(svg_file.name))
+    finally:
+        os.remove(svg_file.name)
+
+
 @app.route('/get_model', methods=['POST'])
 def get_model():
     """returns json model of svg posted"""
     svg_input = request.form['svgInput']
-    svg_file = open("input.svg", "w")
-    svg_file.write(svg_input)
-    svg_file.close()
-    model = svg_to_model('input.svg')
-    return jsonify(model)
+    return app.response_class(
+        response=_svg_to_model_json(svg_input),
+        status=200,
+        mimetype='application/json'
+    )
 
 
 if __name__ == '__main__':
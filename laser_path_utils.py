@@ -1,13 +1,19 @@
 # laser_path_utils.py
 """Utility functions for working with paths for laser cutting"""
 
+import re
+from functools import lru_cache
+
 import numpy as np
 
 import svgpathtools as SVGPT
 # it's imporatant to clone and install the repo manually. The pip/pypi version is outdated
 
 from laser_svg_utils import tree_to_tempfile
-from laser_clipper import point_on_loops, point_inside_loop
+from laser_clipper import point_on_loops
+
+LINE_PATH_RE = re.compile(r'\s*M[\sMLZ0-9eE.,+-]*')
+PATH_TOKEN_RE = re.compile(r'[MLZ]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
 
 
 def tempfile_to_paths(temp_svg):
@@ -57,6 +63,8 @@ def combine_paths(paths, as_list=True):
 
 def path_string_to_points(path_string):
     """Convert path string into a list of points"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        return line_path_string_to_points(path_string)
     path = SVGPT.parse_path(path_string)
 
     empty = SVGPT.Path()
@@ -71,6 +79,72 @@ def path_string_to_points(path_string):
     return points
 
 
+def line_path_string_to_points(path_string):
+    """Convert path string of absolute M, L and Z commands into a list of points"""
+    points = []
+    for start, end in line_path_string_to_segments(path_string):
+        add_line_points(points, start, end)
+    if points == []:
+        return None
+    return points
+
+
+def line_path_string_to_segments(path_string):
+    """splits a path string of absolute M, L and Z commands into (start, end) lines of complex points"""
+    segments = []
+    start = current = None
+    command = None
+    tokens = PATH_TOKEN_RE.findall(path_string)
+    # raise ValueError on malformed strings, as svgpathtools' parse_path does
+    expects_point = False
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        index += 1
+        if token in 'MLZ':
+            if expects_point:
+                break
+            command = token
+            if command == 'Z':
+                if current != start:
+                    segments.append((current, start))
+                current = start
+            else:
+                expects_point = True
+            continue
+        if command == 'Z':
+            raise ValueError("Invalid path string: unexpected coordinates after 'Z'")
+        if index == len(tokens) or tokens[index] in 'MLZ':
+            expects_point = True
+            break
+        point = xy_to_complex((float(token), float(tokens[index])))
+        index += 1
+        expects_point = False
+        if command == 'M':
+            start = current = point
+            # further coordinate pairs after a moveto are implicit linetos
+            command = 'L'
+        else:
+            segments.append((current, point))
+            current = point
+    if expects_point:
+        raise ValueError(f"Invalid path string: command '{command}' expects a coordinate pair")
+    return segments
+
+
+def add_line_points(points, start, end):
+    """appends the endpoints of a line to points, skipping repeated points"""
+    for point in line_endpoints(start, end):
+        if points == [] or point != points[-1]:
+            points.append(point)
+
+
+def line_endpoints(start, end):
+    """returns the endpoints of a line between complex points, matching points_from_line"""
+    distance = end - start
+    return [complex_to_xy(start + distance*fraction) for fraction in (0, 1)]
+
+
 def subpath_to_points(segment):
     """Converts a path segment into a list of points"""
     points = []
@@ -83,6 +157,10 @@ def subpath_to_points(segment):
 
 def get_start(path_string):
     """returns start point (x, y) of a path string"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        segments = line_path_string_to_segments(path_string)
+        if segments:
+            return complex_to_xy(segments[0][0])
     path = SVGPT.parse_path(path_string)
     start_xy = complex_to_xy(path.start)
     return start_xy
@@ -145,14 +223,50 @@ def points_to_path(points, closed=True):
 
 def scale_path(path_string, scale):
     """scales a path string by a scale factor (float)"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        return scale_line_path(path_string, scale)
     path = SVGPT.parse_path(path_string)
     scaled_path = path.scaled(scale)
     new_path_string = scaled_path.d()
     return new_path_string
 
 
+def scale_line_path(path_string, scale):
+    """scales a path string of absolute M, L and Z commands, writing it out as svgpathtools would"""
+    segments = line_path_string_to_segments(path_string)
+    # same arithmetic as svgpathtools' Path.scaled about the origin
+    origin_shift = 0j - scale * 0j
+    scaled_segments = []
+    for start, end in segments:
+        scaled_start = scale * start + origin_shift
+        scaled_segments.append([scaled_start, scale * (end - start) + scaled_start])
+    return line_segments_to_path_string(segments, scaled_segments)
+
+
+def line_segments_to_path_string(segments, new_segments):
+    """writes transformed lines out as svgpathtools' Path.d() would, keeping lines that met joined"""
+    for index in range(len(segments) - 1):
+        if segments[index][1] == segments[index + 1][0]:
+            new_segments[index][1] = new_segments[index + 1][0]
+
+    parts = []
+    current = None
+    for start, end in new_segments:
+        if current != start:
+            parts.append(f"M {start.real},{start.imag}")
+        parts.append(f"L {end.real},{end.imag}")
+        current = end
+    return " ".join(parts)
+
+
 def move_path(path_string, xy_translation):
     """Takes a path string and xy_translation (x, y), and moves it x units over, and y units down"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        complex_translation = xy_to_complex(xy_translation)
+        segments = line_path_string_to_segments(path_string)
+        moved_segments = [[start + complex_translation, end + complex_translation]
+                          for start, end in segments]
+        return line_segments_to_path_string(segments, moved_segments)
 
     path = SVGPT.parse_path(path_string)
 
@@ -168,6 +282,15 @@ def move_path(path_string, xy_translation):
 
 def get_angle(path_string):
     """measures the angle in degrees (CCW) from the path positive X axis (0,0), (0,1)"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        segments = line_path_string_to_segments(path_string)
+        if segments:
+            # same arithmetic as svgpathtools' Path.point at either end
+            first_start, first_end = segments[0]
+            last_start, last_end = segments[-1]
+            vector = (last_start + (last_end - last_start)*1) - \
+                (first_start + (first_end - first_start)*0)
+            return np.angle(vector, deg=True)
     path = SVGPT.parse_path(path_string)
     vector = path.point(1) - path.point(0)
     angle = np.angle(vector, deg=True)
@@ -176,6 +299,16 @@ def get_angle(path_string):
 
 def rotate_path(path_string, angle_degrees, xy_point):
     """rotates a path string a given number of degrees (CCW) around point (x, y)"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        complex_point = xy_to_complex(xy_point)
+        # same rotation factor svgpathtools' rotate builds with numpy
+        rotation = np.exp(1j*np.radians(angle_degrees))
+        segments = line_path_string_to_segments(path_string)
+        rotated_segments = [[rotation*(start - complex_point) + complex_point,
+                             rotation*(end - complex_point) + complex_point]
+                            for start, end in segments]
+        return line_segments_to_path_string(segments, rotated_segments)
+
     path = SVGPT.parse_path(path_string)
 
     empty = SVGPT.Path()
@@ -188,8 +321,13 @@ def rotate_path(path_string, angle_degrees, xy_point):
     return rotated_string
 
 
+@lru_cache(maxsize=4096)
 def get_length(path_string):
-    """returns the length of a path string"""
+    """returns the length of a path string, reusing lengths already measured"""
+    if LINE_PATH_RE.fullmatch(path_string):
+        # straight lines only, so no need for svgpathtools' curve integration
+        return sum(abs(end - start)
+                   for start, end in line_path_string_to_segments(path_string))
     path = SVGPT.parse_path(path_string)
     return path.length()
 
@@ -372,23 +510,17 @@ def separate_closed_paths(paths):
     return closed_paths, open_paths
 
 
-def is_inside(path, other_path):
-    """checks if path is inside other_path and returns true or false"""
-    loop = paths_to_loops([path])[0]
-    other_loop = paths_to_loops([other_path])[0]
-    for point in loop:
-        if point_inside_loop(point, other_loop) == 1:
-            return True
-    return False
-
-
 def path_to_segments(path_string):
     """breaks down a path into a list of segments"""
     segments = []
-    path = SVGPT.parse_path(path_string)
-    for segment in path:
-        if isinstance(segment, SVGPT.path.Line):  # pylint: disable=maybe-no-member
-            points = points_from_line(segment)
-            new_path_string = f"M {points[0][0]} {points[0][1]} L {points[1][0]} {points[1][1]}"
-            segments.append(new_path_string)
+    if LINE_PATH_RE.fullmatch(path_string):
+        lines = line_path_string_to_segments(path_string)
+    else:
+        path = SVGPT.parse_path(path_string)
+        lines = [(segment.start, segment.end) for segment in path
+                 if isinstance(segment, SVGPT.path.Line)]  # pylint: disable=maybe-no-member
+    for start, end in lines:
+        points = line_endpoints(start, end)
+        new_path_string = f"M {points[0][0]} {points[0][1]} L {points[1][0]} {points[1][1]}"
+        segments.append(new_path_string)
     return segments
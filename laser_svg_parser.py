@@ -7,7 +7,8 @@ import json
 
 from laser_svg_utils import (element_to_tree, get_attributes, new_svg_tree,
                              path_string_to_element, tree_to_file)
-from laser_path_utils import tree_to_paths, combine_paths, is_inside
+from laser_path_utils import tree_to_paths, combine_paths, paths_to_loops
+from laser_clipper import get_bounding_box, loop_inside_loop
 
 
 def parse_svg_tree(svg_root, attrib):
@@ -122,13 +123,15 @@ def separate_perims_from_cuts(paths):
     """take a list of paths and returns two lists of paths faces and cuts."""
     perims = []
     cuts = []
-
-    for path in paths:
-        inside = False
-        for other_path in paths:
-            if other_path is not path:
-                if is_inside(path, other_path):
-                    inside = True
+    # parse every path once rather than once per pair
+    loops = [paths_to_loops([path])[0] for path in paths]
+    boxes = [get_bounding_box(loop) for loop in loops]
+
+    for index, path in enumerate(paths):
+        inside = any(loop_inside_loop(loops[index], loops[other_index],
+                                      boxes[index], boxes[other_index])
+                     for other_index in range(len(loops))
+                     if other_index != index)
         if inside:
             cuts.append(path)
         else:
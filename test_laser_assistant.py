@@ -0,0 +1,53 @@
+"""regression checks for joint processing"""
+
+import copy
+import math
+import os
+import unittest
+
+import pyclipper
+
+from laser_assistant import (LaserParameters, extract_embeded_model, get_original_model,
+                             process_joints, scale_design)
+from laser_clipper import SCALING_FACTOR
+from laser_path_utils import paths_to_loops
+
+CANDLE_MODEL = os.path.join(os.path.dirname(__file__), 'input-samples', 'Candle-Model.svg')
+
+# plywood-3mm preset from presets.csv, scaled up
+PARAMETERS = {'preset': 'plywood-3mm', 'notes': '', 'thickness': 3, 'width': 450,
+              'height': 300, 'kerf': 0.05, 'style': '', 'boxC': -0.05, 'boxL': 0.05,
+              'boxI': 0.075, 'tabC': -0.05, 'tabL': 0.05, 'tabI': 0.1, 'slotC': -0.2,
+              'slotL': 0.05, 'slotI': 0.1, 'scale': 1.5}
+
+
+def get_loop_area(loop):
+    """returns the unsigned area of a loop in square units"""
+    scaled_loop = pyclipper.scale_to_clipper(loop, SCALING_FACTOR)
+    return abs(pyclipper.Area(scaled_loop)) / SCALING_FACTOR ** 2
+
+
+class MergeLoopsTest(unittest.TestCase):
+    """cut loops are merged in a single nonzero union"""
+
+    def test_self_touching_cut_loops_are_dropped(self):
+        """box faceb cuts that touch themselves no longer leave a sliver behind"""
+        model = extract_embeded_model(CANDLE_MODEL)
+        for joint in model['joints'].values():
+            joint['joint_parameters'].update(
+                joint_type='Box', angle=math.pi / 2, joint_align='Inside')
+        parameters = LaserParameters(PARAMETERS)
+        scaled_model = scale_design(copy.deepcopy(model), parameters.scale)
+        processed_model = process_joints(
+            get_original_model(scaled_model), scaled_model['joints'], parameters)
+
+        face_loops = paths_to_loops(processed_model['tree']['face2']['paths'])
+        # the old one-at-a-time union kept a 0.04mm^2 sliver along y=323.85,
+        # which the kerf offset then grew into a web across a notch
+        slivers = [loop for loop in face_loops if get_loop_area(loop) < 1]
+        self.assertEqual(slivers, [])
+        self.assertEqual(len(face_loops), 33)
+
+
+if __name__ == '__main__':
+    unittest.main()